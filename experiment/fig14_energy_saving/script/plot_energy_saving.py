@@ -19,13 +19,13 @@ Usage:
 
 import os
 import re
-import glob
 import argparse
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import math
 
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering; skip GUI backend detection
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -65,9 +65,8 @@ BAR_COLORS = {
 }
 
 
-@dataclass
-class PowerData:
-    """Power data from simulation"""
+class PowerData(NamedTuple):
+    """Power data from simulation (immutable, no per-instance __dict__)"""
     average_power: float = 0.0
     background: float = 0.0
     activation: float = 0.0
@@ -141,7 +140,8 @@ def collect_results(results_dir: str) -> Dict[str, Dict[str, PowerData]]:
     """
     results = defaultdict(dict)
 
-    log_files = glob.glob(os.path.join(results_dir, '*.log'))
+    with os.scandir(results_dir) as it:
+        log_files = [e.path for e in it if e.name.endswith('.log') and e.is_file()]
 
     for filepath in log_files:
         config = extract_config_name(filepath)
@@ -14,7 +14,7 @@ Features:
 - Outputs separate PNG/PDF files in a timestamped folder
 
 Usage:
-    python plot_mapping.py [--stats-dir PATH] [--log-dir PATH] [--output-dir PATH]
+    python plot_mapping.py [--stats-dir PATH] [--log-dir PATH] [--output-dir PATH] [--dpi N]
 
 Output:
     output/mapping_MMDD_HHMM/
@@ -26,16 +26,25 @@ Output:
 
 import os
 import re
-import glob
+import mmap
 import argparse
-from collections import defaultdict
-from typing import Dict, Optional, Tuple
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering; skip GUI backend detection
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
 import numpy as np
 
+plt.ioff()
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
 
 # Expected ordering
 WORKLOADS_ORDER = ['mix1', 'mix2', 'mix3', 'mix4', 'mix5', 'mix6', 'mix7']
@@ -68,6 +77,23 @@ BAR_STYLES = {
     ('SMART', 'Ro:Ba:Bg:Co'): {'color': 'black', 'edgecolor': 'black', 'hatch': ''},
     ('SMART', 'Ro:Co:Ba:Bg'): {'color': 'lightgray', 'edgecolor': 'black', 'hatch': ''},
 }
+_DEFAULT_STYLE = {'color': 'gray', 'edgecolor': 'black', 'hatch': ''}
+
+# Above this many bars, draw each series as one collection instead of
+# one Rectangle patch per bar
+_BATCH_BARS_THRESHOLD = 50
+
+# Precompiled parsing patterns
+# IPC under commit section (negative lookbehind avoids matching 'uipc')
+_COMMIT_IPC_RE = re.compile(rb'(?<!u)ipc:\s*([\d.]+)')
+_IPC_RE = re.compile(rb'\bipc:\s*([\d.]+)')
+# bytes patterns: stats files and DRAMSim2 logs are scanned as raw bytes
+_AVG_POWER_RE = re.compile(rb'Average Power \(watts\)\s*:\s*([\d.]+)')
+# Smaller logs are cheaper to read() than to map
+_MMAP_MIN_SIZE = 64 * 1024
+# Stats filename: {CONFIG}_{WORKLOAD}_{SCHEME}.stats
+_FN_RE = re.compile(r'^(?P<stem>(?P<cfg>[^_]+)_(?P<wl>.+)_(?P<sch>%s))\.stats$'
+                    % '|'.join(SCHEMES), re.IGNORECASE)
 
 
 @dataclass
@@ -85,29 +111,59 @@ def parse_stats_file(filepath: str) -> Optional[float]:
         IPC value, or None if parsing fails
     """
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-
-        # Find IPC under commit section (use negative lookbehind to avoid matching 'uipc')
-        commit_pattern = r'commit:.*?(?<!u)ipc:\s*([\d.]+)'
-        match = re.search(commit_pattern, content, re.DOTALL)
-
-        if match:
-            return float(match.group(1))
-
-        # Fallback
-        ipc_pattern = r'\bipc:\s*([\d.]+)'
-        matches = re.findall(ipc_pattern, content)
-        if matches:
-            return float(matches[-1])
-
-        return None
+        in_commit = False
+        last_ipc = None
+
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if not in_commit and b'commit:' in line:
+                    in_commit = True
+                    # Only the text after 'commit:' belongs to the section
+                    line = line[line.index(b'commit:') + len(b'commit:'):]
+
+                # Cheap substring check before running any regex
+                if b'ipc:' not in line:
+                    continue
+
+                # First IPC under commit section wins
+                if in_commit:
+                    # Fast path: "ipc: <value>" lines need no regex, as
+                    # long as the value is one the regex would take whole
+                    stripped = line.lstrip()
+                    if stripped.startswith(b'ipc:'):
+                        tokens = stripped[4:].split()
+                        if tokens and tokens[0].replace(b'.', b'', 1).isdigit():
+                            return float(tokens[0])
+
+                    match = _COMMIT_IPC_RE.search(line)
+                    if match:
+                        return float(match.group(1))
+
+                # Fallback: remember the last plain 'ipc:' value
+                match = _IPC_RE.search(line)
+                if match:
+                    last_ipc = float(match.group(1))
+
+        return last_ipc
 
     except Exception as e:
         print(f"Warning: Failed to parse {filepath}: {e}")
         return None
 
 
+def _last_avg_power(buf) -> Optional[float]:
+    """Return the last 'Average Power' value in a bytes-like buffer."""
+    end = len(buf)
+    while True:
+        pos = buf.rfind(b'Average Power', 0, end)
+        if pos < 0:
+            return None
+        match = _AVG_POWER_RE.match(buf, pos)
+        if match:
+            return float(match.group(1))
+        end = pos
+
+
 def parse_dramsim_log(filepath: str) -> Optional[float]:
     """
     Parse a DRAMSim2 log file and extract total energy.
@@ -118,27 +174,70 @@ def parse_dramsim_log(filepath: str) -> Optional[float]:
         Total energy value, or None if parsing fails
     """
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
+        # Average Power is reported per epoch; only the last (final) value is
+        # needed. We need to normalize anyway, so just use power as proxy for energy
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                return _last_avg_power(f.read())
 
-        # Try to find average power and cycles to calculate energy
-        # Average Power (watts) * cycles / frequency = energy
+            # Large log: let the search run directly over the page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _last_avg_power(mm)
 
-        power_matches = re.findall(r'Average Power \(watts\)\s*:\s*([\d.]+)', content)
-        if power_matches:
-            # Use last (final) value
-            avg_power = float(power_matches[-1])
+    except Exception as e:
+        print(f"Warning: Failed to parse DRAMSim log {filepath}: {e}")
+        return None
 
-            # We need to normalize anyway, so just use power as proxy for energy
-            # Or find total cycles
-            return avg_power
 
+@lru_cache(maxsize=1024)
+def _parse_name(filename: str) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Parse a {CONFIG}_{WORKLOAD}_{SCHEME}.stats filename.
+
+    Returns:
+        (stem, config, workload, scheme), or None if the name does not match
+    """
+    match = _FN_RE.match(filename)
+    if not match:
         return None
 
-    except Exception as e:
-        print(f"Warning: Failed to parse DRAMSim log {filepath}: {e}")
+    config = CONFIG_FILE_MAPPING.get(match['cfg'], match['cfg'])
+    scheme = SCHEMES[match['sch'].lower()]
+    return match['stem'], config, match['wl'], scheme
+
+
+def _parse_one(entry: os.DirEntry, log_dir: str,
+               log_files: Set[str]) -> Optional[Tuple[str, str, str, MappingData]]:
+    """
+    Parse one .stats file and its matching DRAMSim2 log.
+
+    log_files holds the names present in log_dir, so no per-file stat is needed.
+
+    Returns:
+        (workload, config, scheme, MappingData), or None if the file is skipped
+    """
+    # Parse filename: {CONFIG}_{WORKLOAD}_{SCHEME}
+    parsed = _parse_name(entry.name)
+    if parsed is None:
+        return None
+
+    stem, config, workload, scheme = parsed
+
+    # Parse IPC from stats
+    ipc = parse_stats_file(entry.path)
+    if ipc is None:
         return None
 
+    # Try to find corresponding log file for energy (in log_dir)
+    log_filename = stem + '.log'
+    energy = 0.0
+    if log_filename in log_files:
+        energy_val = parse_dramsim_log(os.path.join(log_dir, log_filename))
+        if energy_val:
+            energy = energy_val
+
+    return workload, config, scheme, MappingData(ipc=ipc, energy=energy)
+
 
 def scan_mapping_data(stats_dir: str, log_dir: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, MappingData]]]:
     """
@@ -160,55 +259,33 @@ def scan_mapping_data(stats_dir: str, log_dir: Optional[str] = None) -> Dict[str
     if log_dir is None:
         log_dir = stats_dir
 
-    data = defaultdict(lambda: defaultdict(dict))
-
-    # Find all .stats files
-    pattern = os.path.join(stats_dir, '*.stats')
-    files = glob.glob(pattern)
-
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        name_without_ext = os.path.splitext(filename)[0]
-
-        # Parse filename: {CONFIG}_{WORKLOAD}_{SCHEME}
-        parts = name_without_ext.rsplit('_', 1)
-        if len(parts) < 2:
-            continue
+    data = {}
 
-        # Check if last part is a scheme
-        scheme_raw = parts[1].lower()
-        if scheme_raw not in SCHEMES:
-            continue
+    # Find all .stats files (skip hidden/temp files and directories)
+    with os.scandir(stats_dir) as it:
+        entries = [e for e in it
+                   if e.name.endswith('.stats') and not e.name.startswith('.')
+                   and e.is_file()]
 
-        scheme = SCHEMES[scheme_raw]
+    # List the log directory once instead of checking each log path
+    log_files = set(os.listdir(log_dir)) if os.path.isdir(log_dir) else set()
 
-        # Parse the rest: {CONFIG}_{WORKLOAD}
-        config_workload = parts[0]
-        cw_parts = config_workload.split('_', 1)
-        if len(cw_parts) < 2:
-            continue
+    # Files are independent, so parse them concurrently (I/O bound)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        results = list(ex.map(partial(_parse_one, log_dir=log_dir, log_files=log_files),
+                              entries))
 
-        config_raw, workload = cw_parts[0], cw_parts[1]
-        config = CONFIG_FILE_MAPPING.get(config_raw, config_raw)
-
-        # Parse IPC from stats
-        ipc = parse_stats_file(filepath)
-        if ipc is None:
+    # Merge sequentially in the main thread (no locking needed)
+    for result in results:
+        if result is None:
             continue
 
-        # Try to find corresponding log file for energy (in log_dir)
-        log_filename = name_without_ext + '.log'
-        log_path = os.path.join(log_dir, log_filename)
-        energy = 0.0
-        if os.path.exists(log_path):
-            energy_val = parse_dramsim_log(log_path)
-            if energy_val:
-                energy = energy_val
-
-        data[workload][config][scheme] = MappingData(ipc=ipc, energy=energy)
-        print(f"  Found: {config} / {workload} / {scheme} -> IPC={ipc:.4f}, Energy={energy:.4f}")
+        workload, config, scheme, values = result
+        data.setdefault(workload, {}).setdefault(config, {})[scheme] = values
+        print(f"  Found: {config} / {workload} / {scheme} -> "
+              f"IPC={values.ipc:.4f}, Energy={values.energy:.4f}")
 
-    return dict(data)
+    return data
 
 
 def calculate_normalized_values(data: Dict[str, Dict[str, Dict[str, MappingData]]]) -> Tuple[Dict, Dict]:
@@ -220,8 +297,8 @@ def calculate_normalized_values(data: Dict[str, Dict[str, Dict[str, MappingData]
     Returns:
         (normalized_ipc, normalized_energy) dictionaries
     """
-    normalized_ipc = defaultdict(lambda: defaultdict(dict))
-    normalized_energy = defaultdict(lambda: defaultdict(dict))
+    normalized_ipc = {}
+    normalized_energy = {}
 
     baseline_scheme = 'Ro:Ba:Bg:Co'
 
@@ -236,17 +313,133 @@ def calculate_normalized_values(data: Dict[str, Dict[str, Dict[str, MappingData]
             for scheme, values in schemes.items():
                 # Normalized IPC
                 if baseline.ipc > 0:
-                    normalized_ipc[workload][config][scheme] = values.ipc / baseline.ipc
+                    normalized_ipc.setdefault(workload, {}).setdefault(config, {})[scheme] = \
+                        values.ipc / baseline.ipc
 
                 # Normalized Energy
                 if baseline.energy > 0:
-                    normalized_energy[workload][config][scheme] = values.energy / baseline.energy
+                    normalized_energy.setdefault(workload, {}).setdefault(config, {})[scheme] = \
+                        values.energy / baseline.energy
 
-    return dict(normalized_ipc), dict(normalized_energy)
+    return normalized_ipc, normalized_energy
+
+
+def _build_value_matrix(normalized: Dict, workloads: List[str],
+                        configs: List[str]) -> np.ndarray:
+    """
+    Materialize {workload: {config: {scheme: value}}} into a dense array.
+
+    Returns:
+        Array of shape (n_configs, n_schemes, n_workloads); missing values are 0
+    """
+    wl_index = {wl: i for i, wl in enumerate(workloads)}
+    cfg_index = {cfg: i for i, cfg in enumerate(configs)}
+    sch_index = {sch: i for i, sch in enumerate(SCHEME_ORDER)}
+
+    mat = np.zeros((len(configs), len(SCHEME_ORDER), len(workloads)))
+    for wl, wl_data in normalized.items():
+        wi = wl_index.get(wl)
+        if wi is None:
+            continue
+        for cfg, cfg_data in wl_data.items():
+            ci = cfg_index.get(cfg)
+            if ci is None:
+                continue
+            for sch, val in cfg_data.items():
+                si = sch_index.get(sch)
+                if si is not None and val:
+                    mat[ci, si, wi] = val
+
+    return mat
+
+
+def _plot_grouped_bars(ax, mat: np.ndarray, x: np.ndarray, offsets: np.ndarray,
+                       bar_width: float, styles: List[Dict], labels: List[str],
+                       annotate_thresh: float, annotate_cap: float):
+    """
+    Draw one bar series per row of mat (shape: n_bars x n_workloads).
+
+    Values above annotate_thresh are labeled, placed at most at annotate_cap.
+    """
+    n_bars, n_workloads = mat.shape
+    batch = n_bars * n_workloads > _BATCH_BARS_THRESHOLD
+
+    for bar_idx, values in enumerate(mat):
+        offset = offsets[bar_idx]
+        style = styles[bar_idx]
+
+        if batch:
+            left = x + offset - bar_width / 2
+            right = left + bar_width
+            zeros = np.zeros_like(values)
+            # (n_workloads, 4 corners, xy)
+            verts = np.stack([np.column_stack([left, zeros]),
+                              np.column_stack([left, values]),
+                              np.column_stack([right, values]),
+                              np.column_stack([right, zeros])], axis=1)
+            ax.add_collection(PolyCollection(verts,
+                                             label=labels[bar_idx],
+                                             facecolors=style['color'],
+                                             edgecolors=style['edgecolor'],
+                                             hatch=style['hatch'] or None,
+                                             linewidths=0.5))
+        else:
+            ax.bar(x + offset, values, bar_width,
+                   label=labels[bar_idx],
+                   color=style['color'],
+                   edgecolor=style['edgecolor'],
+                   hatch=style['hatch'],
+                   linewidth=0.5)
+
+        # Add annotations for values above threshold (usually none)
+        mask = values > annotate_thresh
+        if not mask.any():
+            continue
+        for j in np.flatnonzero(mask):
+            val = values[j]
+            ax.annotate(f'{val:.2f}',
+                        xy=(x[j] + offset, min(val, annotate_cap)),
+                        xytext=(0, 3),
+                        textcoords='offset points',
+                        ha='center', va='bottom',
+                        fontsize=7)
+
+    if batch:
+        ax.autoscale_view()
+
+
+def _format_axes(ax, x: np.ndarray, workloads: List[str], ylabel: str,
+                 ylim: Tuple[float, float], title: str):
+    """Apply the shared Figure 15 axis styling."""
+    ax.set(xticks=x, ylim=ylim)
+    ax.set_ylabel(ylabel, fontsize=11)
+    ax.set_xlabel('Workloads', fontsize=11)
+    ax.set_xticklabels(workloads, fontsize=10)
+    ax.axhline(y=1.0, color='black', linewidth=1)
+    ax.yaxis.grid(True, linestyle='--', alpha=0.5)
+    ax.set_axisbelow(True)
+    ax.legend(loc='upper center', bbox_to_anchor=(0.5, 1.15),
+              ncol=3, frameon=False, fontsize=9)
+    ax.set_title(title, fontsize=12, y=1.20)
+
+
+def _save_figure(fig, output_dir: str, basename: str, kind: str, dpi: int = 150):
+    """Save a figure as PNG and PDF."""
+    # Run the constrained layout once, then measure the tight bounding box
+    # and reuse it for both formats
+    fig.draw_without_rendering()
+    tight_bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+
+    png_path = os.path.join(output_dir, basename + '.png')
+    pdf_path = os.path.join(output_dir, basename + '.pdf')
+    fig.savefig(png_path, dpi=dpi, bbox_inches=tight_bbox)
+    fig.savefig(pdf_path, bbox_inches=tight_bbox)
+    print(f"{kind} chart saved to: {png_path}")
+    print(f"{kind} PDF saved to: {pdf_path}")
 
 
 def generate_chart(normalized_ipc: Dict, normalized_energy: Dict,
-                   output_dir: str):
+                   output_dir: str, dpi: int = 150):
     """
     Generate the address mapping sensitivity charts as separate files.
 
@@ -254,36 +447,23 @@ def generate_chart(normalized_ipc: Dict, normalized_energy: Dict,
         normalized_ipc: {workload: {config: {scheme: normalized_value}}}
         normalized_energy: {workload: {config: {scheme: normalized_value}}}
         output_dir: Directory to save the charts (timestamped folder)
+        dpi: Resolution of the PNG outputs (PDF is vector)
     """
-    # Determine available workloads
-    available_workloads = []
-    for wl in WORKLOADS_ORDER:
-        if wl in normalized_ipc or wl in normalized_energy:
-            available_workloads.append(wl)
-
-    # Add any not in order
-    all_wl = set(normalized_ipc.keys()) | set(normalized_energy.keys())
-    for wl in all_wl:
-        if wl not in available_workloads:
-            available_workloads.append(wl)
+    # Determine available workloads (expected order first, extras sorted)
+    all_wl = set(normalized_ipc) | set(normalized_energy)
+    available_workloads = ([wl for wl in WORKLOADS_ORDER if wl in all_wl]
+                           + sorted(all_wl.difference(WORKLOADS_ORDER)))
 
     if not available_workloads:
         print("No data to plot!")
         return
 
     # Determine available configs and schemes
-    available_configs = []
-    all_configs = set()
-    for wl_data in list(normalized_ipc.values()) + list(normalized_energy.values()):
-        all_configs.update(wl_data.keys())
-
-    for cfg in CONFIGS_ORDER:
-        if cfg in all_configs:
-            available_configs.append(cfg)
-
-    for cfg in all_configs:
-        if cfg not in available_configs:
-            available_configs.append(cfg)
+    all_configs = set().union(*(wl_data.keys() for wl_data in
+                                itertools.chain(normalized_ipc.values(),
+                                                normalized_energy.values())))
+    available_configs = ([cfg for cfg in CONFIGS_ORDER if cfg in all_configs]
+                         + sorted(all_configs.difference(CONFIGS_ORDER)))
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -295,122 +475,37 @@ def generate_chart(normalized_ipc: Dict, normalized_energy: Dict,
 
     bar_width = 0.8 / n_bars_per_workload
     x = np.arange(n_workloads)
+    offsets = (np.arange(n_bars_per_workload) - n_bars_per_workload/2 + 0.5) * bar_width
 
-    # ==================== Plot (a) Normalized IPC ====================
-    fig1, ax1 = plt.subplots(figsize=(12, 5))
-
-    bar_idx = 0
-    for config in available_configs:
-        for scheme in SCHEME_ORDER:
-            values = []
-            for wl in available_workloads:
-                val = normalized_ipc.get(wl, {}).get(config, {}).get(scheme, None)
-                values.append(val if val else 0)
-
-            offset = (bar_idx - n_bars_per_workload/2 + 0.5) * bar_width
-            style = BAR_STYLES.get((config, scheme),
-                                   {'color': 'gray', 'edgecolor': 'black', 'hatch': ''})
-
-            label = f'{config} : {scheme}'
-            ax1.bar(x + offset, values, bar_width,
-                   label=label,
-                   color=style['color'],
-                   edgecolor=style['edgecolor'],
-                   hatch=style['hatch'],
-                   linewidth=0.5)
+    ipc_mat = _build_value_matrix(normalized_ipc, available_workloads, available_configs)
+    energy_mat = _build_value_matrix(normalized_energy, available_workloads, available_configs)
 
-            # Add annotations for values > 1.1 or < 0.9
-            for j, val in enumerate(values):
-                if val > 1.1:
-                    ax1.annotate(f'{val:.2f}',
-                               xy=(x[j] + offset, min(val, 1.04)),
-                               xytext=(0, 3),
-                               textcoords='offset points',
-                               ha='center', va='bottom',
-                               fontsize=7)
-
-            bar_idx += 1
-
-    ax1.set_ylabel('Normalized IPC', fontsize=11)
-    ax1.set_xlabel('Workloads', fontsize=11)
-    ax1.set_xticks(x)
-    ax1.set_xticklabels(available_workloads, fontsize=10)
-    ax1.axhline(y=1.0, color='black', linewidth=1)
-    ax1.set_ylim(0.94, 1.04)
-    ax1.yaxis.grid(True, linestyle='--', alpha=0.5)
-    ax1.set_axisbelow(True)
-    ax1.legend(loc='upper center', bbox_to_anchor=(0.5, 1.15),
-              ncol=3, frameon=False, fontsize=9)
-    ax1.set_title('(a) Normalized IPC', fontsize=12, y=1.20)
+    # Bar styles and legend labels, in bar_idx order (config-major)
+    styles = [BAR_STYLES.get((config, scheme), _DEFAULT_STYLE)
+              for config in available_configs for scheme in SCHEME_ORDER]
+    labels = [f'{config} : {scheme}'
+              for config in available_configs for scheme in SCHEME_ORDER]
 
-    plt.tight_layout()
-
-    # Save IPC chart
-    ipc_png = os.path.join(output_dir, 'fig15a_normalized_ipc.png')
-    ipc_pdf = os.path.join(output_dir, 'fig15a_normalized_ipc.pdf')
-    fig1.savefig(ipc_png, dpi=150, bbox_inches='tight')
-    fig1.savefig(ipc_pdf, bbox_inches='tight')
-    print(f"IPC chart saved to: {ipc_png}")
-    print(f"IPC PDF saved to: {ipc_pdf}")
-    plt.close(fig1)
+    # Both charts share one figure (cleared in between) to keep caches warm
+    # ==================== Plot (a) Normalized IPC ====================
+    fig, ax1 = plt.subplots(figsize=(12, 5), layout='constrained')
+    _plot_grouped_bars(ax1, ipc_mat.reshape(n_bars_per_workload, n_workloads),
+                       x, offsets, bar_width, styles, labels,
+                       annotate_thresh=1.1, annotate_cap=1.04)
+    _format_axes(ax1, x, available_workloads, 'Normalized IPC', (0.94, 1.04),
+                 '(a) Normalized IPC')
+    _save_figure(fig, output_dir, 'fig15a_normalized_ipc', 'IPC', dpi)
 
     # ==================== Plot (b) Normalized Energy ====================
-    fig2, ax2 = plt.subplots(figsize=(12, 5))
-
-    bar_idx = 0
-    for config in available_configs:
-        for scheme in SCHEME_ORDER:
-            values = []
-            for wl in available_workloads:
-                val = normalized_energy.get(wl, {}).get(config, {}).get(scheme, None)
-                values.append(val if val else 0)
-
-            offset = (bar_idx - n_bars_per_workload/2 + 0.5) * bar_width
-            style = BAR_STYLES.get((config, scheme),
-                                   {'color': 'gray', 'edgecolor': 'black', 'hatch': ''})
-
-            label = f'{config} : {scheme}'
-            ax2.bar(x + offset, values, bar_width,
-                   label=label,
-                   color=style['color'],
-                   edgecolor=style['edgecolor'],
-                   hatch=style['hatch'],
-                   linewidth=0.5)
-
-            # Add annotations for values > 1.1
-            for j, val in enumerate(values):
-                if val > 1.1:
-                    ax2.annotate(f'{val:.2f}',
-                               xy=(x[j] + offset, min(val, 1.1)),
-                               xytext=(0, 3),
-                               textcoords='offset points',
-                               ha='center', va='bottom',
-                               fontsize=7)
-
-            bar_idx += 1
-
-    ax2.set_ylabel('Normalized Energy', fontsize=11)
-    ax2.set_xlabel('Workloads', fontsize=11)
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(available_workloads, fontsize=10)
-    ax2.axhline(y=1.0, color='black', linewidth=1)
-    ax2.set_ylim(0.94, 1.1)
-    ax2.yaxis.grid(True, linestyle='--', alpha=0.5)
-    ax2.set_axisbelow(True)
-    ax2.legend(loc='upper center', bbox_to_anchor=(0.5, 1.15),
-              ncol=3, frameon=False, fontsize=9)
-    ax2.set_title('(b) Normalized Energy', fontsize=12, y=1.20)
-
-    plt.tight_layout()
-
-    # Save Energy chart
-    energy_png = os.path.join(output_dir, 'fig15b_normalized_energy.png')
-    energy_pdf = os.path.join(output_dir, 'fig15b_normalized_energy.pdf')
-    fig2.savefig(energy_png, dpi=150, bbox_inches='tight')
-    fig2.savefig(energy_pdf, bbox_inches='tight')
-    print(f"Energy chart saved to: {energy_png}")
-    print(f"Energy PDF saved to: {energy_pdf}")
-    plt.close(fig2)
+    fig.clear()
+    ax2 = fig.add_subplot(111)
+    _plot_grouped_bars(ax2, energy_mat.reshape(n_bars_per_workload, n_workloads),
+                       x, offsets, bar_width, styles, labels,
+                       annotate_thresh=1.1, annotate_cap=1.1)
+    _format_axes(ax2, x, available_workloads, 'Normalized Energy', (0.94, 1.1),
+                 '(b) Normalized Energy')
+    _save_figure(fig, output_dir, 'fig15b_normalized_energy', 'Energy', dpi)
+    plt.close(fig)
 
     print(f"\nAll charts saved to: {output_dir}")
 
@@ -433,6 +528,8 @@ def main():
     parser.add_argument('--output-dir', type=str,
                         default=default_output_dir,
                         help='Output directory path (default: auto-generated timestamped folder)')
+    parser.add_argument('--dpi', type=int, default=150,
+                        help='PNG resolution (default: 150)')
 
     args = parser.parse_args()
 
@@ -471,7 +568,7 @@ def main():
         return
 
     # Generate charts (separate files in timestamped folder)
-    generate_chart(normalized_ipc, normalized_energy, output_dir)
+    generate_chart(normalized_ipc, normalized_energy, output_dir, args.dpi)
 
 
 if __name__ == '__main__':
@@ -9,62 +9,107 @@ This script fixes the Refresh value and recalculates Average Power.
 import re
 import argparse
 import os
+import errno
+import mmap
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 
+_POWER_HEADER = b'== Power Data for Rank'
+_IO_BUFFER = 1 << 20
+
+# Power Data block; 'head' and 'body' keep the literal text around the
+# Average and Refresh values so a fixed block is rebuilt byte-for-byte.
+# Lines may end in CRLF, which text mode used to translate for us
+_POWER_RE = re.compile(
+    rb'(?P<head>== Power Data for Rank\s+\d+\r?\n'
+    rb'\s+Average Power \(watts\)\s+:\s+)[\d.]+'
+    rb'(?P<body>\r?\n'
+    rb'\s+-Background \(watts\)\s+:\s+(?P<bg>[\d.]+)\r?\n'
+    rb'\s+-Act/Pre\s+\(watts\)\s+:\s+(?P<ap>[\d.]+)\r?\n'
+    rb'\s+-Burst\s+\(watts\)\s+:\s+(?P<bu>[\d.]+)\r?\n'
+    rb'\s+-Refresh\s+\(watts\)\s+:\s+)(?P<rf>[\d.]+)(?P<eol>\r?\n)'
+)
+# head, Average, body, Refresh, line ending
+_FIXED_BLOCK = b'%s%.3f%s%.3f%s'
+
+
 def should_process_file(filepath: str) -> bool:
     """Check if file should be processed (SMART or Conv, not DRAM)."""
     filename = os.path.basename(filepath).upper()
     return ('SMART' in filename or 'CONV' in filename) and 'DRAM' not in filename
 
 
-def clean_power_data(content: str, threshold: float = 0.1) -> tuple[str, int]:
-    """
-    Clean Power Data blocks in log content.
+def _fix_block(match, threshold: float):
+    """Return the rewritten Power Data block, or None if it needs no fix."""
+    # Check if refresh needs fixing before parsing the other values
+    if float(match.group('rf')) <= threshold:
+        return None
 
-    Returns:
-        tuple: (cleaned_content, number_of_fixes)
-    """
-    # Pattern to match Power Data block
-    pattern = re.compile(
-        r'(== Power Data for Rank\s+\d+\n)'
-        r'(\s+Average Power \(watts\)\s+:\s+)([\d.]+)(\n)'
-        r'(\s+-Background \(watts\)\s+:\s+)([\d.]+)(\n)'
-        r'(\s+-Act/Pre\s+\(watts\)\s+:\s+)([\d.]+)(\n)'
-        r'(\s+-Burst\s+\(watts\)\s+:\s+)([\d.]+)(\n)'
-        r'(\s+-Refresh\s+\(watts\)\s+:\s+)([\d.]+)(\n)',
-        re.MULTILINE
-    )
+    head, body, eol, background, act_pre, burst = match.group(
+        'head', 'body', 'eol', 'bg', 'ap', 'bu')
+    new_refresh = 0.000
+    new_average = float(background) + float(act_pre) + float(burst) + new_refresh
 
-    fixes = 0
+    return _FIXED_BLOCK % (head, new_average, body, new_refresh, eol)
 
-    def replace_block(match):
-        nonlocal fixes
 
-        # Extract values
-        background = float(match.group(6))
-        act_pre = float(match.group(9))
-        burst = float(match.group(12))
-        refresh = float(match.group(15))
-
-        # Check if refresh needs fixing
-        if refresh > threshold:
-            fixes += 1
-            new_refresh = 0.000
-            new_average = background + act_pre + burst + new_refresh
+def clean_power_data(data, threshold: float = 0.1) -> list[tuple[int, int, bytes]]:
+    """
+    Find Power Data blocks in log bytes that need cleaning.
 
-            return (
-                f"{match.group(1)}"
-                f"{match.group(2)}{new_average:.3f}{match.group(4)}"
-                f"{match.group(5)}{match.group(6)}{match.group(7)}"
-                f"{match.group(8)}{match.group(9)}{match.group(10)}"
-                f"{match.group(11)}{match.group(12)}{match.group(13)}"
-                f"{match.group(14)}{new_refresh:.3f}{match.group(16)}"
-            )
-        return match.group(0)
+    Block headers are located with a plain substring search; the regex
+    only runs at those offsets.
 
-    cleaned = pattern.sub(replace_block, content)
-    return cleaned, fixes
+    Returns:
+        list: (start, end, replacement) for each fixed block, in file order
+    """
+    fixes = []
+
+    start = data.find(_POWER_HEADER)
+    while start >= 0:
+        match = _POWER_RE.match(data, start)
+        if match is None:
+            start = data.find(_POWER_HEADER, start + 1)
+            continue
+
+        fixed = _fix_block(match, threshold)
+        if fixed is not None:
+            fixes.append((start, match.end(), fixed))
+        start = data.find(_POWER_HEADER, match.end())
+
+    return fixes
+
+
+def _write_all(fd: int, buf: bytes):
+    """Write all of buf to fd; os.write() may write less than asked."""
+    view = memoryview(buf)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _copy_range(in_fd: int, out_fd: int, offset: int, count: int):
+    """Copy count bytes at offset of in_fd to out_fd, in-kernel where possible."""
+    try:
+        while count > 0:
+            sent = os.sendfile(out_fd, in_fd, offset, count)
+            if sent == 0:
+                return
+            offset += sent
+            count -= sent
+    except OSError as e:
+        # sendfile() to a regular file is Linux-only
+        if e.errno not in (errno.EINVAL, errno.ENOTSOCK, errno.ENOSYS):
+            raise
+        while count > 0:
+            chunk = os.pread(in_fd, min(count, _IO_BUFFER), offset)
+            if not chunk:
+                return
+            _write_all(out_fd, chunk)
+            offset += len(chunk)
+            count -= len(chunk)
 
 
 def process_file(input_path: str, threshold: float = 0.1) -> str:
@@ -74,19 +119,33 @@ def process_file(input_path: str, threshold: float = 0.1) -> str:
     Returns:
         str: Output file path
     """
-    with open(input_path, 'r') as f:
-        content = f.read()
-
-    cleaned, fixes = clean_power_data(content, threshold)
-
     # Generate output filename
     path = Path(input_path)
     output_path = path.parent / f"{path.stem}_cleaned{path.suffix}"
 
-    with open(output_path, 'w') as f:
-        f.write(cleaned)
+    with open(input_path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        fixes = []
+        if size:
+            # Scan the page cache directly instead of copying the log
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                fixes = clean_power_data(data, threshold)
 
-    print(f"  {path.name}: {fixes} fixes -> {output_path.name}")
+        if not fixes:
+            shutil.copyfile(input_path, output_path)
+        else:
+            # Splice unchanged spans from the input; only fixed blocks
+            # are written from Python
+            with open(output_path, 'wb', buffering=0) as dst:
+                in_fd, out_fd = src.fileno(), dst.fileno()
+                offset = 0
+                for start, end, fixed in fixes:
+                    _copy_range(in_fd, out_fd, offset, start - offset)
+                    _write_all(out_fd, fixed)
+                    offset = end
+                _copy_range(in_fd, out_fd, offset, size - offset)
+
+    print(f"  {path.name}: {len(fixes)} fixes -> {output_path.name}")
     return str(output_path)
 
 
@@ -104,6 +163,12 @@ def main():
         default=0.1,
         help='Refresh power threshold (default: 0.1W)'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of worker processes for directories (default: CPU count)'
+    )
 
     args = parser.parse_args()
     path = Path(args.path)
@@ -118,15 +183,22 @@ def main():
         log_files = list(path.glob('*.log'))
         print(f"Found {len(log_files)} log files in {path}")
 
-        processed = 0
+        # Leave earlier *_cleaned.log outputs alone: a worker would be
+        # reading one while another truncates it, so reruns stay safe
+        targets = []
         for log_file in log_files:
-            if should_process_file(str(log_file)):
-                process_file(str(log_file), args.threshold)
-                processed += 1
+            if log_file.stem.endswith('_cleaned'):
+                print(f"  Skipping {log_file.name} (cleaned output)")
+            elif should_process_file(str(log_file)):
+                targets.append(str(log_file))
             else:
                 print(f"  Skipping {log_file.name}")
 
-        print(f"\nProcessed {processed} files")
+        # Files are independent; fan them out across processes
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            list(pool.map(partial(process_file, threshold=args.threshold), targets))
+
+        print(f"\nProcessed {len(targets)} files")
 
     else:
         print(f"Error: {path} not found")
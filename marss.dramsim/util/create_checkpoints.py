@@ -4,16 +4,22 @@ import os
 import subprocess
 import sys
 
+# Unbuffered stdout so progress shows up live when piped to tee or a log
+sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', 0)
 
 # Set up default variables
 cwd = os.getcwd()
 qemu_bin = '%s/qemu/qemu-system-x86_64' % cwd
+qemu_img_tool = '%s/qemu/qemu-img' % cwd
 # qemu_img = '/home/avadh/workspace/vm/spec2006_2.qcow2'
 qemu_img = '/home/avadh/workspace/vm/splash_4core_orig.qcow2'
 # qemu_img = '/var/work/vm/splash_4core.qcow2'
 vm_memory = 4096
 qemu_cmd = ''
 vm_smp = 4
+# Skip checkpoints whose snapshot is already in the image; set to False
+# to recreate them
+skip_existing = True
 
 def add_to_cmd(opt):
     global qemu_cmd
@@ -397,11 +403,28 @@ print("Number of Chekcpoints to create: %d" % len(check_list))
 
 login_cmds = ["root\n", "root\n"]
 
+def existing_snapshots(img):
+    # Read snapshot tags from the qcow2 header, no need to boot the VM
+    try:
+        out = subprocess.Popen([qemu_img_tool, 'snapshot', '-l', img],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE).communicate()[0]
+    except OSError:
+        return set()
+
+    tags = set()
+    for line in out.splitlines():
+        fields = line.split()
+        if len(fields) > 1 and fields[0].isdigit():
+            tags.add(fields[1])
+    return tags
+
 def pty_to_stdout(fd, untill_chr):
-    chr = '1'
-    while chr != untill_chr:
-        chr = os.read(fd, 1)
-        sys.stdout.write(chr)
+    # Read whatever the pty has buffered instead of one byte per syscall
+    data = '1'
+    while data and untill_chr not in data:
+        data = os.read(fd, 4096)
+        sys.stdout.write(data)
     sys.stdout.flush()
 
 def pty_login(fd):
@@ -411,12 +434,18 @@ def pty_login(fd):
 
 # Start simulation from checkpoints
 pty_prefix = 'char device redirected to '
+done_list = existing_snapshots(qemu_img) if skip_existing else set()
 for checkpoint in check_list:
 
+    if checkpoint['name'] in done_list:
+        print("Checkpoint %s already exists, skipping" % checkpoint['name'])
+        continue
+
     print("Starting QEMU for checkpoint: %s" % checkpoint['name'])
 
+    # Buffered pipe so readline() doesn't issue one read() per byte
     p = subprocess.Popen(qemu_cmd.split(), stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT, bufsize=0)
+            stderr=subprocess.STDOUT, bufsize=-1)
 
     pty_term = None
 
@@ -450,7 +479,9 @@ for checkpoint in check_list:
     pty_to_stdout(pty_term, '#')
 
     sys.stdout.write('\n')
-    for line in p.stdout:
+    # readline() instead of file iteration, which holds lines back in
+    # its read-ahead buffer until it fills
+    for line in iter(p.stdout.readline, ''):
         sys.stdout.write(line)
 
     # Wait for simulation to complete